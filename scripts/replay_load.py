@@ -0,0 +1,218 @@
+"""
+Replays customer payloads against the churn API and reports throughput,
+p50/p95/p99 latency and error rate.
+
+With --rate, requests follow a fixed schedule and latency is measured from
+each request's scheduled time, so queueing delay shows up in the tail
+percentiles when the server falls behind.
+
+Runs against the in-process ASGI app by default (no network needed), or a
+running uvicorn server with --url.
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+
+import httpx
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+CHOICES = {
+    "gender": ["Male", "Female"],
+    "Partner": ["Yes", "No"],
+    "Dependents": ["Yes", "No"],
+    "PhoneService": ["Yes", "No"],
+    "MultipleLines": ["Yes", "No", "No phone service"],
+    "InternetService": ["DSL", "Fiber optic", "No"],
+    "OnlineSecurity": ["Yes", "No", "No internet service"],
+    "OnlineBackup": ["Yes", "No", "No internet service"],
+    "DeviceProctection": ["Yes", "No", "No internet service"],
+    "TechSupport": ["Yes", "No", "No internet service"],
+    "StreamingTV": ["Yes", "No", "No internet service"],
+    "StreamingMovies": ["Yes", "No", "No internet service"],
+    "Contract": ["Month-to-month", "One year", "Two year"],
+    "PaperlessBilling": ["Yes", "No"],
+    "PaymentMethod": [
+        "Electronic check", "Mailed check",
+        "Bank transfer (automatic)", "Credit card (automatic)",
+    ],
+}
+NUMERIC_FIELDS = ["tenure", "MonthlyCharges", "TotalCharges"]
+REQUIRED_FIELDS = set(CHOICES) | set(NUMERIC_FIELDS)
+
+
+def synthetic_customer(rng: random.Random) -> dict:
+    row = {c: rng.choice(v) for c, v in CHOICES.items()}
+    row["tenure"] = rng.randint(0, 72)
+    row["MonthlyCharges"] = round(rng.uniform(18.0, 120.0), 2)
+    row["TotalCharges"] = round(row["MonthlyCharges"] * max(row["tenure"], 1), 2)
+    return row
+
+
+def load_payloads(path: str) -> list:
+    """Read customer payloads from JSONL, skipping lines that aren't CustomerData records."""
+    payloads = []
+    if not path or not os.path.exists(path):
+        return payloads
+
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(row, dict) and REQUIRED_FIELDS <= set(row):
+                payloads.append({k: row[k] for k in REQUIRED_FIELDS})
+    return payloads
+
+
+def build_requests(payloads: list, endpoints: list, total: int, batch_size: int, seed: int) -> list:
+    """Expand payloads (or synthetic customers) into `total` (path, body) pairs, round-robin over endpoints."""
+    rng = random.Random(seed)
+
+    def customer(i):
+        if payloads:
+            return payloads[i % len(payloads)]
+        return synthetic_customer(rng)
+
+    reqs = []
+    for i in range(total):
+        ep = endpoints[i % len(endpoints)]
+        if ep == "/predict":
+            body = customer(i)
+        else:
+            body = {"customers": [customer(i * batch_size + j) for j in range(batch_size)]}
+        reqs.append((ep, body))
+    return reqs
+
+
+def percentile(sorted_vals: list, q: float) -> float:
+    if not sorted_vals:
+        return float("nan")
+    idx = min(len(sorted_vals) - 1, max(0, math.ceil(q / 100 * len(sorted_vals)) - 1))
+    return sorted_vals[idx]
+
+
+async def _send(client, path, body, stats, t0):
+    # t0 is the scheduled send time in rate-limited mode, so time spent waiting
+    # for a free worker counts as latency instead of being hidden
+    ok = False
+    try:
+        resp = await client.post(path, json=body)
+        # the API reports model failures as 200 + {"error": ...}
+        ok = resp.status_code < 400 and "error" not in resp.json()
+    except Exception:
+        ok = False
+    latency = time.perf_counter() - t0
+
+    stats.setdefault(path, []).append((latency, ok))
+
+
+async def run(client, reqs: list, concurrency: int, rate: float) -> tuple:
+    stats = {}
+    queue = asyncio.Queue()
+    for i, r in enumerate(reqs):
+        queue.put_nowait((i, r))
+
+    interval = 1.0 / rate if rate > 0 else 0.0
+    start = time.perf_counter()
+
+    async def worker():
+        while True:
+            try:
+                i, (path, body) = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if interval:
+                # fixed open-loop schedule: request i is due at start + i * interval
+                # whether or not earlier requests have finished
+                scheduled = start + i * interval
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            else:
+                scheduled = time.perf_counter()
+            await _send(client, path, body, stats, scheduled)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return stats, time.perf_counter() - start
+
+
+def report(stats: dict, elapsed: float, target_rate: float):
+    rows = dict(stats)
+    rows["ALL"] = [s for v in stats.values() for s in v]
+
+    print(f"\n{'endpoint':<16}{'reqs':>7}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>9}")
+    for name, samples in rows.items():
+        lat = sorted(l for l, _ in samples)
+        errs = sum(1 for _, ok in samples if not ok)
+        n = len(samples)
+        print(
+            f"{name:<16}{n:>7}{n / elapsed:>9.1f}"
+            f"{percentile(lat, 50) * 1000:>9.1f}{percentile(lat, 95) * 1000:>9.1f}"
+            f"{percentile(lat, 99) * 1000:>9.1f}{errs / max(n, 1):>9.2%}"
+        )
+    total = len(rows["ALL"])
+    achieved = total / elapsed if elapsed > 0 else 0.0
+    print(f"\nElapsed: {elapsed:.2f}s")
+    if target_rate:
+        print(f"Achieved rate: {achieved:.1f} req/s of {target_rate:.1f} target ({achieved / target_rate:.0%})")
+    else:
+        print(f"Achieved rate: {achieved:.1f} req/s (unbounded)")
+
+
+async def main_async(args):
+    endpoints = ["/" + e.strip().strip("/") for e in args.endpoints.split(",") if e.strip()]
+    payloads = load_payloads(args.input)
+    print(f"Loaded {len(payloads)} payloads from {args.input}"
+          + ("" if payloads else " - using synthetic customers"))
+
+    reqs = build_requests(payloads, endpoints, args.requests, args.batch_size, args.seed)
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+        print(f"Target: {args.url}")
+    else:
+        # keep synthetic traffic out of the audit/drift prediction log
+        os.environ.setdefault("PREDICTION_LOG_ENABLED", "0")
+        from src.app.main import app
+        transport = httpx.ASGITransport(app=app)
+        client = httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout)
+        print("Target: in-process ASGI app")
+
+    async with client:
+        if args.warmup:
+            await run(client, reqs[:args.warmup], args.concurrency, 0)
+        stats, elapsed = await run(client, reqs, args.concurrency, args.rate)
+
+    print(f"Concurrency: {args.concurrency} | Target rate: {args.rate or 'unbounded'} req/s")
+    report(stats, elapsed, args.rate)
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Load test for the churn prediction API")
+    p.add_argument("--input", type=str, default="requests.jsonl",
+                   help="JSONL of CustomerData payloads; synthetic customers are used if none are found")
+    p.add_argument("--url", type=str, default=None,
+                   help="base URL of a running server (e.g. http://127.0.0.1:8000), else in-process")
+    p.add_argument("--endpoints", type=str, default="/predict,/predict/batch,/explain")
+    p.add_argument("--requests", type=int, default=500)
+    p.add_argument("--concurrency", type=int, default=16)
+    p.add_argument("--rate", type=float, default=0, help="requests/sec across all workers, 0 = unbounded")
+    p.add_argument("--batch_size", type=int, default=32, help="customers per batch/explain request")
+    p.add_argument("--warmup", type=int, default=10)
+    p.add_argument("--timeout", type=float, default=30.0)
+    p.add_argument("--seed", type=int, default=42)
+
+    args = p.parse_args()
+    asyncio.run(main_async(args))
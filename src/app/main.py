@@ -1,8 +1,22 @@
+import time
+
+import pydantic
 from fastapi import FastAPI
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, conlist
 import gradio as gr
 
-from src.serving.inference import predict
+from src.serving import prediction_log
+from src.serving.inference import MODEL_RUN_ID, score_batch, explain_batch, global_importance
+from src.serving.schemas import CustomerData
+
+MAX_BATCH_SIZE = 256
+MAX_TOP_K = 10
+
+# pydantic v2 renamed conlist's min_items/max_items to min_length/max_length
+if pydantic.VERSION.startswith("1."):
+    _BATCH_BOUNDS = {"min_items": 1, "max_items": MAX_BATCH_SIZE}
+else:
+    _BATCH_BOUNDS = {"min_length": 1, "max_length": MAX_BATCH_SIZE}
 
 app = FastAPI(
     title = "telco Customer Chrun Prediction API",
@@ -11,43 +25,89 @@ app = FastAPI(
 )
 
 
+@app.on_event("startup")
+def start_prediction_sink():
+    prediction_log.start_sink()
+
+
+@app.on_event("shutdown")
+def stop_prediction_sink():
+    prediction_log.stop_sink()
+
+
 @app.get("/")
 def root():
     return {"status":"ok"}
 
 
+@app.get("/metrics/prediction-log")
+def prediction_log_stats():
+    if prediction_log.sink is None:
+        return {"enabled": False}
+    return {"enabled": True, **prediction_log.sink.stats()}
+
+
+def score_and_log(records: list) -> list:
+    # every caller (API and UI) scores here so all predictions reach the sink
+    t0 = time.perf_counter()
+    labels, probas = score_batch(records)
+    latency_ms = (time.perf_counter() - t0) * 1000
+
+    sink = prediction_log.sink
+    if sink is not None:
+        for features, proba in zip(records, probas):
+            sink.log(features, proba, MODEL_RUN_ID, latency_ms, batch_size=len(records))
+    return labels
 
-class CustomerData(BaseModel):
-    gender:str
-    Partner : str
-    Dependents: str
-    PhoneService : str
-    MultipleLines: str
-    InternetService : str
-    OnlineSecurity : str
-    OnlineBackup : str
-    DeviceProctection : str
-    TechSupport : str
-    StreamingTV : str
-    StreamingMovies : str
-    Contract: str
-    PaperlessBilling : str
-    PaymentMethod : str
-    tenure : int
-    MonthlyCharges : float
-    TotalCharges : float
 
 
 @app.post("/predict")
 def get_prediction(data: CustomerData):
 
     try:
-        result = predict(data.dict())
+        result = score_and_log([data.dict()])[0]
         return {"prediction": result}
     except Exception as e:
         return {"error": str(e)}
 
 
+class CustomerBatch(BaseModel):
+    customers: conlist(CustomerData, **_BATCH_BOUNDS)
+
+
+class ExplainRequest(CustomerBatch):
+    top_k: int = Field(3, ge=1, le=MAX_TOP_K)
+
+
+@app.post("/predict/batch")
+def get_batch_prediction(batch: CustomerBatch):
+
+    try:
+        results = score_and_log([c.dict() for c in batch.customers])
+        return {"predictions": results}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@app.post("/explain")
+def get_explanation(req: ExplainRequest):
+
+    try:
+        results = explain_batch([c.dict() for c in req.customers], top_k=req.top_k)
+        return {"explanations": results}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@app.get("/explain/global")
+def get_global_importance():
+
+    try:
+        return {"importance": global_importance()}
+    except Exception as e:
+        return {"error": str(e)}
+
+
 def gradio_interface(
     gender, Partner, Dependents, PhoneService, MultipleLines,
     InternetService, OnlineSecurity, OnlineBackup, DeviceProtection,
@@ -64,7 +124,7 @@ def gradio_interface(
         "InternetService": InternetService,
         "OnlineSecurity": OnlineSecurity,
         "OnlineBackup": OnlineBackup,
-        "DeviceProtection": DeviceProtection,
+        "DeviceProctection": DeviceProtection,
         "TechSupport": TechSupport,
         "StreamingTV": StreamingTV,
         "StreamingMovies": StreamingMovies,
@@ -76,7 +136,7 @@ def gradio_interface(
         "TotalCharges": float(TotalCharges),      
     }
      
-     result = predict(data)
+     result = score_and_log([data])[0]
      return str(result)
 
 
@@ -0,0 +1,37 @@
+import numpy as np
+
+
+def source_field(col: str, fields: list):
+    """Return the field a training column was encoded from, or None if it has none."""
+    # pd.get_dummies names one-hot columns "<field>_<value>"; take the longest
+    # matching field so a prefix of another field name can't capture its columns
+    matches = [f for f in fields if col == f or col.startswith(f + "_")]
+    return max(matches, key=len) if matches else None
+
+
+def build_field_map(feature_cols: list, fields: list) -> np.ndarray:
+    """(n_features, n_fields) 0/1 matrix folding encoded columns onto their source field."""
+    field_map = np.zeros((len(feature_cols), len(fields)))
+    for i, col in enumerate(feature_cols):
+        f = source_field(col, fields)
+        if f is not None:
+            field_map[i, fields.index(f)] = 1.0
+    return field_map
+
+
+def fold_contributions(contribs: np.ndarray, field_map: np.ndarray) -> tuple:
+    """
+    Fold XGBoost pred_contribs output (last column = bias) onto fields.
+
+    Returns (field_contribs, base) where field_contribs.sum(axis=1) + base is the
+    raw margin. Columns with no source field are folded into base with the bias.
+    """
+    field_contribs = contribs[:, :-1] @ field_map
+    base = contribs.sum(axis=1) - field_contribs.sum(axis=1)
+    return field_contribs, base
+
+
+def top_k_indices(field_contribs: np.ndarray, k: int) -> np.ndarray:
+    """Per-row field indices ordered by descending |contribution|."""
+    k = max(1, min(k, field_contribs.shape[1]))
+    return np.argsort(-np.abs(field_contribs), axis=1, kind="stable")[:, :k]
@@ -2,8 +2,13 @@
 import os
 import glob
 import json
+import numpy as np
 import pandas as pd
 import mlflow
+import xgboost as xgb
+
+from src.serving.explain import source_field, build_field_map, fold_contributions, top_k_indices
+from src.serving.schemas import CUSTOMER_FIELDS
 
 def _find_model():
     paths = glob.glob("./mlruns/*/models/*/artifacts")
@@ -15,6 +20,7 @@ def _find_model():
 try:
     MODEL_DIR = _find_model()
     model = mlflow.pyfunc.load_model(MODEL_DIR)
+    MODEL_RUN_ID = getattr(model.metadata, "run_id", None)
     print(f"Model loaded successfully from {MODEL_DIR}")
 except Exception as e:
     raise Exception(f"Failed to load model: {e}")
@@ -40,10 +46,17 @@ BINARY_MAP = {
 
 NUMERIC_COLS = ["tenure", "MonthlyCharges", "TotalCharges"]
 
+# CustomerData field -> training column name, where the two differ
+FIELD_ALIASES = {"DeviceProctection": "DeviceProtection"}
+
+# training columns the API doesn't collect; _serve_transform fills them with 0
+IMPUTED_COLS = ["SeniorCitizen"]
+
 
 def _serve_transform(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
     df.columns = df.columns.str.strip()
+    df = df.rename(columns=FIELD_ALIASES)
 
     
     for c in NUMERIC_COLS:
@@ -62,9 +75,11 @@ def _serve_transform(df: pd.DataFrame) -> pd.DataFrame:
             )
 
     
+    # keep every category and let the reindex below pick the training columns;
+    # drop_first here would drop whichever category sorts first in *this* batch
     obj_cols = df.select_dtypes(include=["object"]).columns.tolist()
     if obj_cols:
-        df = pd.get_dummies(df, columns=obj_cols, drop_first=True)
+        df = pd.get_dummies(df, columns=obj_cols)
 
     
     bool_cols = df.select_dtypes(include=["bool"]).columns
@@ -77,24 +92,120 @@ def _serve_transform(df: pd.DataFrame) -> pd.DataFrame:
 
 
 
-def predict(input_dict: dict) -> str:
-    df = pd.DataFrame([input_dict])  
+def _label(result) -> str:
+    if result == 1:
+        return " Likely to Churn"
+    else:
+        return "Not Likely to Churn"
+
 
+def score_batch(records: list) -> tuple:
+    """Return (labels, churn probabilities) from a single booster pass."""
+    df = pd.DataFrame(records)
     df_enc = _serve_transform(df)
 
     try:
-        preds = model.predict(df_enc)
-        if hasattr(preds, "tolist"):
-            preds = preds.tolist()
-
-        if isinstance(preds, (list, tuple)) and len(preds) == 1:  
-            result = preds[0]
-        else:
-            result = preds
+        proba = _get_booster().inplace_predict(df_enc.astype(float))
     except Exception as e:
         raise Exception(f"Model prediction failed: {e}")
 
-    if result == 1:
-        return " Likely to Churn"
-    else:
-        return "Not Likely to Churn"
+    proba = np.asarray(proba, dtype=float).reshape(len(df_enc), -1)[:, -1]
+    labels = [_label(int(p >= 0.5)) for p in proba]
+    return labels, proba.tolist()
+
+
+def predict_batch(records: list) -> list:
+    return score_batch(records)[0]
+
+
+def predict(input_dict: dict) -> str:
+    return predict_batch([input_dict])[0]
+
+
+# ---------------------------------------------------------------------------
+# Explanations: XGBoost native SHAP values (pred_contribs) over a whole batch
+# ---------------------------------------------------------------------------
+
+# training-side name of each CustomerData field, in the same order
+SOURCE_FIELDS = [FIELD_ALIASES.get(f, f) for f in CUSTOMER_FIELDS]
+
+_unmapped = [
+    c for c in FEATURE_COLS
+    if source_field(c, SOURCE_FIELDS) is None and c not in IMPUTED_COLS
+]
+if _unmapped:
+    raise Exception(f"Feature columns with no CustomerData source field: {_unmapped}")
+
+_FIELD_MAP = build_field_map(FEATURE_COLS, SOURCE_FIELDS)
+
+_BOOSTER = None
+_IMPORTANCE_CACHE = {}
+
+
+def _get_booster():
+    global _BOOSTER
+    if _BOOSTER is not None:
+        return _BOOSTER
+
+    try:
+        raw = model.get_raw_model()
+    except Exception as e:
+        raise Exception(f"Could not access the underlying model: {e}")
+
+    booster = raw.get_booster() if hasattr(raw, "get_booster") else raw
+    if not isinstance(booster, xgb.Booster):
+        raise Exception(f"Explanations require an XGBoost model, got {type(raw).__name__}")
+
+    _BOOSTER = booster
+    return _BOOSTER
+
+
+def explain_batch(records: list, top_k: int = 3) -> list:
+    df = pd.DataFrame(records)
+    df_enc = _serve_transform(df)
+
+    try:
+        booster = _get_booster()
+        dmat = xgb.DMatrix(df_enc.astype(float), feature_names=FEATURE_COLS)
+        contribs = booster.predict(dmat, pred_contribs=True)
+    except Exception as e:
+        raise Exception(f"Model explanation failed: {e}")
+
+    # bias and imputed-only columns land in base_value, so drivers are CustomerData fields
+    field_contribs, base = fold_contributions(contribs, _FIELD_MAP)
+    margin = contribs.sum(axis=1)
+    proba = 1.0 / (1.0 + np.exp(-margin))
+    top_idx = top_k_indices(field_contribs, top_k)
+
+    results = []
+    for row, idx in enumerate(top_idx):
+        results.append({
+            "churn_probability": float(proba[row]),
+            "base_value": float(base[row]),
+            "drivers": [
+                {"feature": CUSTOMER_FIELDS[j], "contribution": float(field_contribs[row, j])}
+                for j in idx
+            ],
+        })
+    return results
+
+
+def global_importance() -> dict:
+    if MODEL_DIR in _IMPORTANCE_CACHE:
+        return _IMPORTANCE_CACHE[MODEL_DIR]
+
+    try:
+        # total (not average) gain, so summing a field's one-hot columns is meaningful
+        scores = _get_booster().get_score(importance_type="total_gain")
+    except Exception as e:
+        raise Exception(f"Failed to compute feature importances: {e}")
+
+    gain = np.array([scores.get(c, 0.0) for c in FEATURE_COLS]) @ _FIELD_MAP
+    total = gain.sum() or 1.0
+    importance = {
+        CUSTOMER_FIELDS[j]: float(gain[j] / total)
+        for j in np.argsort(-gain)
+    }
+
+    _IMPORTANCE_CACHE[MODEL_DIR] = importance
+    return importance
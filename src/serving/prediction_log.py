@@ -0,0 +1,257 @@
+import os
+import json
+import time
+import queue
+import logging
+import threading
+from datetime import datetime, timezone
+
+from src.utils.utils import setup_logger
+
+
+LOG_ENABLED = os.getenv("PREDICTION_LOG_ENABLED", "1").lower() not in ("0", "false", "no")
+LOG_DIR = os.getenv("PREDICTION_LOG_DIR", os.path.join("logs", "predictions"))
+LOG_FORMAT = os.getenv("PREDICTION_LOG_FORMAT", "jsonl")
+
+
+class PredictionSink:
+    """
+    Buffers prediction records in a bounded queue and writes them in batches
+    from a background thread, so the request path never touches the disk.
+
+    policy="drop"  -> records are discarded (and counted) when the queue is full
+    policy="block" -> the caller waits up to `block_timeout` seconds, then drops
+
+    Output files rotate once they reach `max_file_bytes` or `max_file_age`
+    seconds. Parquet files get one row group per flush and are only readable
+    after rotation or stop(), when the footer is written.
+    """
+
+    def __init__(
+        self,
+        log_dir: str = LOG_DIR,
+        fmt: str = LOG_FORMAT,
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 2.0,
+        max_file_bytes: int = 50 * 1024 * 1024,
+        max_file_age: float = 3600.0,
+        policy: str = "drop",
+        block_timeout: float = 0.05,
+    ):
+        if fmt not in ("jsonl", "parquet"):
+            raise ValueError(f"Unsupported prediction log format: {fmt}")
+        if policy not in ("drop", "block"):
+            raise ValueError(f"Unsupported queue policy: {policy}")
+        if fmt == "parquet":
+            try:
+                import pyarrow.parquet  # noqa: F401
+            except ImportError:
+                raise ValueError("PREDICTION_LOG_FORMAT=parquet requires pyarrow to be installed")
+
+        self.log_dir = log_dir
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_file_bytes = max_file_bytes
+        self.max_file_age = max_file_age
+        self.policy = policy
+        self.block_timeout = block_timeout
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._count_lock = threading.Lock()
+        # serialises file writes and the written/write_errors counters
+        # between the worker thread and stop()
+        self._write_lock = threading.Lock()
+
+        self._current_file = None
+        self._opened_at = 0.0
+        self._parquet_writer = None
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.write_errors = 0
+
+        os.makedirs(self.log_dir, exist_ok=True)
+        # one ops log per process: setup_logger adds a FileHandler on every call
+        self.logger = logging.getLogger("prediction_sink")
+        if not self.logger.handlers:
+            self.logger = setup_logger("prediction_sink", os.path.join(self.log_dir, "prediction_sink.log"))
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="prediction-sink", daemon=True)
+            self._thread.start()
+            self.logger.info(f"Prediction sink started: dir={self.log_dir} format={self.fmt} policy={self.policy}")
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                self.logger.warning(f"Prediction sink worker did not exit within {timeout}s")
+
+        # drain anything enqueued after the worker's last pass
+        self._flush(self._drain())
+        with self._write_lock:
+            self._close_file()
+        self.logger.info(f"Prediction sink stopped: {self.stats()}")
+
+    def log(self, features: dict, probability: float, run_id, latency_ms: float, batch_size: int = 1):
+        """
+        Enqueue one prediction. `latency_ms` is the scoring time of the whole
+        call the row came from and `batch_size` the number of rows in it.
+        """
+        record = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "run_id": run_id,
+            "probability": probability,
+            "latency_ms": latency_ms,
+            "batch_size": batch_size,
+            "features": features,
+        }
+        try:
+            if self.policy == "block":
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+            with self._count_lock:
+                self.enqueued += 1
+        except queue.Full:
+            with self._count_lock:
+                self.dropped += 1
+                dropped = self.dropped
+            if dropped % 1000 == 1:
+                self.logger.warning(f"Prediction log queue full, {dropped} records dropped so far")
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "written": self.written,
+            "write_errors": self.write_errors,
+        }
+
+    def _drain(self, limit: int = None) -> list:
+        batch = []
+        while limit is None or len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            deadline = time.monotonic() + self.flush_interval
+            batch = []
+            while len(batch) < self.batch_size and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=min(remaining, 0.5)))
+                except queue.Empty:
+                    continue
+                batch.extend(self._drain(self.batch_size - len(batch)))
+            self._flush(batch)
+
+    def _flush(self, batch: list):
+        if not batch:
+            return
+        with self._write_lock:
+            try:
+                if self._should_rotate():
+                    self._close_file()
+                if self.fmt == "parquet":
+                    self._write_parquet(batch)
+                else:
+                    self._write_jsonl(batch)
+                self.written += len(batch)
+            except Exception as e:
+                self.write_errors += 1
+                self.logger.error(f"Failed to write {len(batch)} prediction records: {e}")
+
+    def _should_rotate(self) -> bool:
+        if self._current_file is None:
+            return False
+        if time.monotonic() - self._opened_at >= self.max_file_age:
+            return True
+        return os.path.exists(self._current_file) and os.path.getsize(self._current_file) >= self.max_file_bytes
+
+    def _open_file(self) -> str:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S-%f")
+        self._current_file = os.path.join(self.log_dir, f"predictions-{stamp}.{self.fmt}")
+        self._opened_at = time.monotonic()
+        self.logger.info(f"Rotated prediction log to {self._current_file}")
+        return self._current_file
+
+    def _close_file(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        self._current_file = None
+
+    def _write_jsonl(self, batch: list):
+        path = self._current_file or self._open_file()
+        with open(path, "a") as f:
+            f.write("".join(json.dumps(r) + "\n" for r in batch))
+
+    def _write_parquet(self, batch: list):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # fixed types for the record envelope, so e.g. an all-None run_id in the
+        # first batch doesn't pin the column to the null type
+        envelope = {
+            "timestamp": pa.string(),
+            "run_id": pa.string(),
+            "probability": pa.float64(),
+            "latency_ms": pa.float64(),
+            "batch_size": pa.int64(),
+        }
+        table = pa.table({
+            name: pa.array([r[name] for r in batch], type=typ)
+            for name, typ in envelope.items()
+        })
+        features = pa.Table.from_pylist([r["features"] for r in batch])
+        for name in features.column_names:
+            table = table.append_column(f"features.{name}", features[name])
+
+        if self._parquet_writer is not None:
+            try:
+                table = table.cast(self._parquet_writer.schema)
+            except (pa.ArrowException, ValueError):
+                # the feature columns changed shape; start a new file for the new schema
+                self._close_file()
+
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(self._open_file(), table.schema)
+        self._parquet_writer.write_table(table)
+
+
+sink = None
+
+
+def start_sink():
+    """Build and start the process-wide sink, unless PREDICTION_LOG_ENABLED is off."""
+    global sink
+    if LOG_ENABLED and sink is None:
+        sink = PredictionSink()
+        sink.start()
+    return sink
+
+
+def stop_sink():
+    global sink
+    if sink is not None:
+        sink.stop()
+        sink = None
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+
+
+class CustomerData(BaseModel):
+    gender:str
+    Partner : str
+    Dependents: str
+    PhoneService : str
+    MultipleLines: str
+    InternetService : str
+    OnlineSecurity : str
+    OnlineBackup : str
+    DeviceProctection : str
+    TechSupport : str
+    StreamingTV : str
+    StreamingMovies : str
+    Contract: str
+    PaperlessBilling : str
+    PaymentMethod : str
+    tenure : int
+    MonthlyCharges : float
+    TotalCharges : float
+
+
+CUSTOMER_FIELDS = list(getattr(CustomerData, "model_fields", None) or CustomerData.__fields__)
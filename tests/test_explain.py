@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+from xgboost import XGBClassifier
+
+from src.serving.explain import source_field, build_field_map, fold_contributions, top_k_indices
+
+
+FIELDS = ["Contract", "tenure", "Partner"]
+
+
+@pytest.fixture(scope="module")
+def trained():
+    rng = np.random.default_rng(0)
+    n = 400
+    raw = pd.DataFrame({
+        "Contract": rng.choice(["Month-to-month", "One year", "Two year"], n),
+        "tenure": rng.integers(0, 72, n),
+        "Partner": rng.integers(0, 2, n),
+        "SeniorCitizen": rng.integers(0, 2, n),
+    })
+    X = pd.get_dummies(raw, columns=["Contract"], drop_first=True).astype(float)
+    y = ((raw["Contract"] == "Month-to-month") & (raw["tenure"] < 24)).astype(int)
+
+    model = XGBClassifier(n_estimators=20, max_depth=3, random_state=42)
+    model.fit(X, y)
+
+    booster = model.get_booster()
+    dmat = xgb.DMatrix(X.iloc[:50], feature_names=list(X.columns))
+    contribs = booster.predict(dmat, pred_contribs=True)
+    margin = booster.predict(dmat, output_margin=True)
+    return list(X.columns), contribs, margin
+
+
+def test_source_field_matches_one_hot_columns():
+    assert source_field("Contract_Two year", FIELDS) == "Contract"
+    assert source_field("tenure", FIELDS) == "tenure"
+    assert source_field("SeniorCitizen", FIELDS) is None
+
+
+def test_source_field_prefers_longest_field():
+    fields = ["Streaming", "StreamingTV"]
+    assert source_field("StreamingTV_Yes", fields) == "StreamingTV"
+    assert source_field("Streaming_Yes", fields) == "Streaming"
+
+
+def test_folded_contributions_sum_to_margin(trained):
+    cols, contribs, margin = trained
+    field_map = build_field_map(cols, FIELDS)
+
+    field_contribs, base = fold_contributions(contribs, field_map)
+
+    assert field_contribs.shape == (len(margin), len(FIELDS))
+    np.testing.assert_allclose(field_contribs.sum(axis=1) + base, margin, rtol=1e-5, atol=1e-5)
+
+
+def test_one_hot_columns_fold_onto_their_field(trained):
+    cols, contribs, _ = trained
+    field_map = build_field_map(cols, FIELDS)
+
+    field_contribs, base = fold_contributions(contribs, field_map)
+
+    contract_idx = [i for i, c in enumerate(cols) if c.startswith("Contract_")]
+    senior_idx = cols.index("SeniorCitizen")
+    np.testing.assert_allclose(field_contribs[:, 0], contribs[:, contract_idx].sum(axis=1), rtol=1e-6)
+    # the unmapped column goes into the base with the bias, not into any field
+    np.testing.assert_allclose(base, contribs[:, -1] + contribs[:, senior_idx], rtol=1e-5, atol=1e-6)
+
+
+def test_top_k_orders_by_absolute_contribution():
+    field_contribs = np.array([
+        [0.1, -0.5, 0.3],
+        [-0.2, 0.05, 0.0],
+    ])
+
+    idx = top_k_indices(field_contribs, 2)
+
+    assert idx.tolist() == [[1, 2], [0, 1]]
+
+
+def test_top_k_is_clamped_to_field_count():
+    field_contribs = np.zeros((1, 3))
+
+    assert top_k_indices(field_contribs, 10).shape == (1, 3)
+    assert top_k_indices(field_contribs, 0).shape == (1, 1)
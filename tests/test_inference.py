@@ -0,0 +1,135 @@
+import os
+import sys
+import json
+import importlib
+
+import numpy as np
+import pandas as pd
+import pytest
+import mlflow.sklearn
+from xgboost import XGBClassifier
+
+from src.features.build_features import build_features
+
+
+CHOICES = {
+    "gender": ["Male", "Female"],
+    "Partner": ["Yes", "No"],
+    "Dependents": ["Yes", "No"],
+    "PhoneService": ["Yes", "No"],
+    "MultipleLines": ["Yes", "No", "No phone service"],
+    "InternetService": ["DSL", "Fiber optic", "No"],
+    "OnlineSecurity": ["Yes", "No", "No internet service"],
+    "OnlineBackup": ["Yes", "No", "No internet service"],
+    "DeviceProtection": ["Yes", "No", "No internet service"],
+    "TechSupport": ["Yes", "No", "No internet service"],
+    "StreamingTV": ["Yes", "No", "No internet service"],
+    "StreamingMovies": ["Yes", "No", "No internet service"],
+    "Contract": ["Month-to-month", "One year", "Two year"],
+    "PaperlessBilling": ["Yes", "No"],
+    "PaymentMethod": [
+        "Electronic check", "Mailed check",
+        "Bank transfer (automatic)", "Credit card (automatic)",
+    ],
+}
+
+
+def _customer(**overrides):
+    row = {c: v[0] for c, v in CHOICES.items()}
+    row["DeviceProctection"] = row.pop("DeviceProtection")
+    row.update({"tenure": 12, "MonthlyCharges": 70.0, "TotalCharges": 840.0})
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture(scope="module")
+def inference(tmp_path_factory):
+    """Train a small model on the training feature layout and import inference against it."""
+    root = tmp_path_factory.mktemp("serving")
+    rng = np.random.default_rng(0)
+    n = 500
+
+    raw = pd.DataFrame({c: rng.choice(v, n) for c, v in CHOICES.items()})
+    raw["SeniorCitizen"] = rng.integers(0, 2, n)
+    raw["tenure"] = rng.integers(0, 72, n)
+    raw["MonthlyCharges"] = rng.uniform(18, 120, n)
+    raw["TotalCharges"] = raw["MonthlyCharges"] * raw["tenure"]
+    raw["Churn"] = (
+        (raw["Contract"] == "Month-to-month")
+        | (raw["InternetService"] == "Fiber optic")
+        | (raw["PaymentMethod"] == "Electronic check")
+    ).astype(int)
+
+    df = build_features(raw, target_col="Churn")
+    X = df.drop(columns=["Churn"]).astype(float)
+    model = XGBClassifier(n_estimators=30, max_depth=4, random_state=42)
+    model.fit(X, df["Churn"])
+
+    os.makedirs(root / "artifacts")
+    with open(root / "artifacts" / "feature_columns.json", "w") as f:
+        json.dump(list(X.columns), f)
+    mlflow.sklearn.save_model(model, str(root / "mlruns" / "0" / "models" / "m-test" / "artifacts"))
+
+    cwd = os.getcwd()
+    os.chdir(root)
+    try:
+        sys.modules.pop("src.serving.inference", None)
+        module = importlib.import_module("src.serving.inference")
+    finally:
+        os.chdir(cwd)
+    yield module
+    sys.modules.pop("src.serving.inference", None)
+
+
+TARGET = _customer(
+    InternetService="Fiber optic", Contract="Two year", PaymentMethod="Electronic check",
+    OnlineSecurity="Yes", StreamingTV="Yes",
+)
+OTHERS = [
+    _customer(InternetService="DSL", Contract="Month-to-month", PaymentMethod="Bank transfer (automatic)"),
+    _customer(InternetService="No", OnlineSecurity="No internet service", StreamingTV="No internet service"),
+]
+
+
+def test_encoding_does_not_depend_on_batch(inference):
+    alone = inference._serve_transform(pd.DataFrame([TARGET]))
+    batched = inference._serve_transform(pd.DataFrame([OTHERS[0], TARGET, OTHERS[1]]))
+
+    pd.testing.assert_series_equal(alone.iloc[0], batched.iloc[1], check_names=False, check_dtype=False)
+    assert alone.iloc[0]["InternetService_Fiber optic"] == 1
+    assert alone.iloc[0]["Contract_Two year"] == 1
+
+
+def test_score_batch_matches_single_row(inference):
+    labels_alone, proba_alone = inference.score_batch([TARGET])
+    labels_batch, proba_batch = inference.score_batch([OTHERS[0], TARGET, OTHERS[1]])
+
+    assert labels_batch[1] == labels_alone[0]
+    assert proba_batch[1] == pytest.approx(proba_alone[0], abs=1e-6)
+
+
+def test_explain_batch_matches_single_row(inference):
+    alone = inference.explain_batch([TARGET], top_k=5)[0]
+    batched = inference.explain_batch([OTHERS[0], TARGET, OTHERS[1]], top_k=5)[1]
+
+    assert batched["churn_probability"] == pytest.approx(alone["churn_probability"], abs=1e-6)
+    assert [d["feature"] for d in batched["drivers"]] == [d["feature"] for d in alone["drivers"]]
+    for a, b in zip(alone["drivers"], batched["drivers"]):
+        assert b["contribution"] == pytest.approx(a["contribution"], abs=1e-6)
+
+
+def test_explain_probability_matches_score(inference):
+    _, proba = inference.score_batch([TARGET] + OTHERS)
+    explained = inference.explain_batch([TARGET] + OTHERS)
+
+    assert [e["churn_probability"] for e in explained] == pytest.approx(proba, abs=1e-5)
+
+
+def test_drivers_are_customer_fields(inference):
+    explained = inference.explain_batch([TARGET] + OTHERS, top_k=10)
+    importance = inference.global_importance()
+
+    features = {d["feature"] for e in explained for d in e["drivers"]}
+    assert features <= set(inference.CUSTOMER_FIELDS)
+    assert "SeniorCitizen" not in importance
+    assert sum(importance.values()) == pytest.approx(1.0)
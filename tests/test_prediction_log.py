@@ -0,0 +1,139 @@
+import os
+import json
+import time
+
+import pytest
+
+from src.serving.prediction_log import PredictionSink
+
+
+def _make_sink(tmp_path, **kwargs):
+    return PredictionSink(log_dir=str(tmp_path), fmt="jsonl", **kwargs)
+
+
+def _log_n(sink, n):
+    for i in range(n):
+        sink.log({"tenure": i}, 0.5, "run-1", 1.0)
+
+
+def _jsonl_files(tmp_path):
+    return sorted(p for p in os.listdir(tmp_path) if p.endswith(".jsonl"))
+
+
+def _read_records(tmp_path):
+    records = []
+    for name in _jsonl_files(tmp_path):
+        with open(os.path.join(tmp_path, name)) as f:
+            records.extend(json.loads(line) for line in f)
+    return records
+
+
+def test_drop_policy_counts_records_when_queue_is_full(tmp_path):
+    sink = _make_sink(tmp_path, max_queue=2, policy="drop")
+
+    _log_n(sink, 5)
+
+    stats = sink.stats()
+    assert stats["enqueued"] == 2
+    assert stats["dropped"] == 3
+    assert stats["queued"] == 2
+
+
+def test_block_policy_waits_then_drops(tmp_path):
+    sink = _make_sink(tmp_path, max_queue=1, policy="block", block_timeout=0.1)
+    _log_n(sink, 1)
+
+    t0 = time.monotonic()
+    _log_n(sink, 1)
+    waited = time.monotonic() - t0
+
+    assert waited >= 0.1
+    assert sink.stats()["dropped"] == 1
+
+
+def test_invalid_policy_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        _make_sink(tmp_path, policy="spill")
+
+
+def test_jsonl_rotates_on_size(tmp_path):
+    sink = _make_sink(tmp_path, max_file_bytes=200)
+
+    for _ in range(3):
+        _log_n(sink, 2)
+        sink._flush(sink._drain())
+
+    assert len(_jsonl_files(tmp_path)) == 3
+    assert len(_read_records(tmp_path)) == 6
+    assert sink.stats()["written"] == 6
+
+
+def test_jsonl_appends_below_size_limit(tmp_path):
+    sink = _make_sink(tmp_path)
+
+    for _ in range(3):
+        _log_n(sink, 2)
+        sink._flush(sink._drain())
+
+    assert len(_jsonl_files(tmp_path)) == 1
+
+
+def test_stop_drains_queued_records(tmp_path):
+    sink = _make_sink(tmp_path, flush_interval=60.0, batch_size=1000)
+    sink.start()
+
+    _log_n(sink, 25)
+    sink.stop(timeout=5.0)
+
+    records = _read_records(tmp_path)
+    assert len(records) == 25
+    assert sink.stats()["written"] == 25
+    assert sink.stats()["queued"] == 0
+    assert records[0]["run_id"] == "run-1"
+    assert records[0]["batch_size"] == 1
+
+
+def test_sinks_share_a_single_ops_log_handler(tmp_path):
+    first = _make_sink(tmp_path / "a")
+    handlers = list(first.logger.handlers)
+
+    _make_sink(tmp_path / "b")
+    _make_sink(tmp_path / "c")
+
+    assert first.logger.handlers == handlers
+    assert len(handlers) == 1
+
+
+def test_parquet_keeps_writing_after_null_run_id(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    sink = PredictionSink(log_dir=str(tmp_path), fmt="parquet")
+
+    for run_id in (None, "run-1", "run-1", None):
+        for i in range(3):
+            sink.log({"tenure": i, "Contract": "One year"}, 0.5, run_id, 1.0)
+        sink._flush(sink._drain())
+    sink.stop()
+
+    assert sink.stats()["write_errors"] == 0
+    assert sink.stats()["written"] == 12
+
+    files = sorted(p for p in os.listdir(tmp_path) if p.endswith(".parquet"))
+    assert len(files) == 1
+    table = pq.read_table(os.path.join(tmp_path, files[0]))
+    assert table.num_rows == 12
+    assert table.column("run_id").to_pylist()[:4] == [None, None, None, "run-1"]
+    assert table.column("features.tenure").to_pylist()[:3] == [0, 1, 2]
+
+
+def test_parquet_appends_row_groups_and_rotates_on_size(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    sink = PredictionSink(log_dir=str(tmp_path), fmt="parquet", max_file_bytes=1)
+
+    for _ in range(3):
+        _log_n(sink, 4)
+        sink._flush(sink._drain())
+    sink.stop()
+
+    files = sorted(p for p in os.listdir(tmp_path) if p.endswith(".parquet"))
+    assert len(files) == 3
+    assert sum(pq.read_table(os.path.join(tmp_path, f)).num_rows for f in files) == 12